@@ -9,7 +9,7 @@
 # ///
 # !/usr/bin/env python3
 import itertools
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 from typing import Optional
 
 import time
@@ -19,9 +19,10 @@ import acquire_zarr as aqz
 from pathlib import Path
 
 import csv
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import traceback
-from dataclasses import asdict
 
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -78,6 +79,7 @@ def make_param_grid(base_path: str) -> list[BenchmarkParams]:
 
     compressors = ["none", "blosc_lz4", "blosc_zstd"]
     frame_count = 512  # fixed for chunk/shard sweep
+    scaling_frame_counts = [8, 16, 32, 64, 128, 256, 512, 1024]
 
     grid = []
     for (cxy, cf), (sxy, sf), comp in itertools.product(
@@ -96,17 +98,16 @@ def make_param_grid(base_path: str) -> list[BenchmarkParams]:
         ))
 
     # Frame count scaling — fix a reasonable middle config
-    for n in [8, 16, 32, 64, 128, 256, 512, 1024]:
-        for compressor in compressors:
-            grid.append(BenchmarkParams(
-                frame_width=W, frame_height=H,
-                frame_count=n,
-                dtype=DTYPE,
-                chunk_width=256, chunk_height=256, chunk_frames=1,
-                shard_width_chunks=4, shard_height_chunks=4, shard_frames_chunks=1,
-                compressor=compressor,
-                store_path=f"{base_path}/scaling_n{n}.zarr",
-            ))
+    for n, compressor in itertools.product(scaling_frame_counts, compressors):
+        grid.append(BenchmarkParams(
+            frame_width=W, frame_height=H,
+            frame_count=n,
+            dtype=DTYPE,
+            chunk_width=256, chunk_height=256, chunk_frames=1,
+            shard_width_chunks=4, shard_height_chunks=4, shard_frames_chunks=1,
+            compressor=compressor,
+            store_path=f"{base_path}/scaling_n{n}_{compressor}.zarr",
+        ))
 
     return grid
 
@@ -193,57 +194,115 @@ def run_benchmark(params: BenchmarkParams) -> BenchmarkResult:
         return BenchmarkResult(params=params, elapsed_s=0, bytes_written=0, error=str(e))
 
 
+def _safe_run_benchmark(params: BenchmarkParams) -> BenchmarkResult:
+    try:
+        return run_benchmark(params)
+    except Exception as e:
+        traceback.print_exc()
+        return BenchmarkResult(params=params, elapsed_s=0,
+                               bytes_written=0, error=str(e))
+
+
+def _pin_worker(core_sets) -> None:
+    """Pin this pool worker to the next unclaimed set of cores."""
+    os.sched_setaffinity(0, core_sets.get())
+
+
 def run_all(grid: list[BenchmarkParams],
             output_csv: str = "benchmark_results.csv",
-            base_path: str = "/var/tmp/zarr_bench") -> list[BenchmarkResult]:
+            base_path: str = "/var/tmp/zarr_bench",
+            jobs: int = 1) -> list[BenchmarkResult]:
+    """
+    Run every benchmark in `grid`, writing one CSV row per result.
+
+    With jobs > 1, up to `jobs` benchmarks run concurrently in worker
+    processes. They share the disk, so use this for quick sweeps rather
+    than for publishable numbers. Where supported (Linux), each worker is
+    pinned to its own slice of the available cores, and benchmarks left at
+    max_threads=0 are limited to that slice's size.
+    """
     os.makedirs(base_path, exist_ok=True)
     results = []
 
-    # flatten nested params dict into top-level columns
+    # flatten params into top-level columns
+    param_names = [p.name for p in fields(BenchmarkParams)]
     fieldnames = (
-            [f"params.{k}" for k in asdict(grid[0]).keys()]
+            [f"params.{k}" for k in param_names]
             + ["elapsed_s", "bytes_written", "throughput_gbps", "error"]
     )
 
     with open(output_csv, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for i, params in enumerate(grid):
-            print(f"[{i + 1}/{len(grid)}] "
-                  f"chunk={params.chunk_width}px cf={params.chunk_frames} "
-                  f"shard={params.shard_width_chunks}x{params.shard_frames_chunks} "
-                  f"comp={params.compressor} n={params.frame_count} ... ",
-                  end="", flush=True)
-
-            try:
-                result = run_benchmark(params)
-            except Exception as e:
-                traceback.print_exc()
-                result = BenchmarkResult(params=params, elapsed_s=0,
-                                         bytes_written=0, error=str(e))
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
 
-            results.append(result)
+        def describe(i: int, params: BenchmarkParams) -> str:
+            return (f"[{i + 1}/{len(grid)}] "
+                    f"chunk={params.chunk_width}px cf={params.chunk_frames} "
+                    f"shard={params.shard_width_chunks}x{params.shard_frames_chunks} "
+                    f"comp={params.compressor} n={params.frame_count} ... ")
+
+        def status(result: BenchmarkResult) -> str:
+            return (f"ERROR: {result.error}" if result.error
+                    else f"{result.throughput_gbps:.3f} GB/s")
 
-            if result.error:
-                print(f"ERROR: {result.error}")
-            else:
-                print(f"{result.throughput_gbps:.3f} GB/s")
+        def record(result: BenchmarkResult):
+            params = result.params
+            results.append(result)
 
             # write row immediately so a crash mid-run doesn't lose data
-            row = {f"params.{k}": v for k, v in asdict(params).items()}
-            row["elapsed_s"] = result.elapsed_s
-            row["bytes_written"] = result.bytes_written
-            row["throughput_gbps"] = result.throughput_gbps
-            row["error"] = result.error or ""
+            row = [getattr(params, k) for k in param_names]
+            row += [result.elapsed_s, result.bytes_written,
+                    result.throughput_gbps, result.error or ""]
             writer.writerow(row)
             f.flush()
 
+        def remove_store(params: BenchmarkParams):
             # clean up store so disk doesn't fill up
             store = Path(params.store_path)
             if store.exists():
                 shutil.rmtree(store)
 
+        if jobs <= 1:
+            for i, params in enumerate(grid):
+                print(describe(i, params), end="", flush=True)
+                result = _safe_run_benchmark(params)
+                print(status(result))
+                record(result)
+                remove_store(params)
+        else:
+            pool_kwargs = {}
+            if hasattr(os, "sched_setaffinity"):
+                cores = sorted(os.sched_getaffinity(0))
+                per_job = max(1, len(cores) // jobs)
+                core_sets = multiprocessing.Queue()
+                for j in range(jobs):
+                    start = (j * per_job) % len(cores)
+                    core_sets.put(set(cores[start:start + per_job]))
+                pool_kwargs = dict(initializer=_pin_worker,
+                                   initargs=(core_sets,))
+                grid = [replace(params, max_threads=per_job)
+                        if params.max_threads == 0 else params
+                        for params in grid]
+
+            with ProcessPoolExecutor(max_workers=jobs,
+                                     **pool_kwargs) as executor:
+                futures = {executor.submit(_safe_run_benchmark, params): i
+                           for i, params in enumerate(grid)}
+                # remove each store as soon as its run finishes, but record
+                # results in grid order so the CSV is the same on every run
+                pending = {}
+                next_i = 0
+                for future in as_completed(futures):
+                    result = future.result()
+                    remove_store(result.params)
+                    pending[futures[future]] = result
+                    while next_i in pending:
+                        result = pending.pop(next_i)
+                        print(describe(next_i, result.params)
+                              + status(result), flush=True)
+                        record(result)
+                        next_i += 1
+
     print(f"\nDone. Results written to {output_csv}")
     return results
 
@@ -347,6 +406,8 @@ if __name__ == "__main__":
                         help="Path to write results CSV")
     parser.add_argument("--no-viz", action="store_true",
                         help="Skip visualization after benchmarking")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of benchmarks to run concurrently")
     args = parser.parse_args()
 
     aqz.set_log_level(aqz.LogLevel.NONE)
@@ -354,7 +415,8 @@ if __name__ == "__main__":
     grid = make_param_grid(base_path=args.base_path)
 
     print(f"Running {len(grid)} benchmarks...\n")
-    run_all(grid, output_csv=args.output_csv, base_path=args.base_path)
+    run_all(grid, output_csv=args.output_csv, base_path=args.base_path,
+            jobs=args.jobs)
 
     if not args.no_viz:
         plot_all(args.output_csv)
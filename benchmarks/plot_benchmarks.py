@@ -1,28 +1,134 @@
-import json
 import click
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
 from pathlib import Path
+from types import MappingProxyType
+import matplotlib
+
+matplotlib.use("Agg")  # only ever saves to files; skip GUI backend setup
 import matplotlib.pyplot as plt
 import numpy as np
 import re
 
+try:
+    import ijson
+except ImportError:  # fall back to parsing whole files in extract_fields
+    ijson = None
 
-def create_platform_label(platform_name: str, system_info: dict) -> str:
-    """Create a readable platform label from system info."""
-    os_name = system_info.get("platform", platform_name)
-    arch = system_info.get("architecture", "")
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-    # Simplify OS names
-    os_map = {"Darwin": "macOS", "Windows": "Windows", "Linux": "Linux"}
-    os_display = os_map.get(os_name, os_name)
+BENCHMARK_FILE_PATTERN = re.compile(r"benchmark-(.+?)-([a-f0-9]+)\.json")
 
-    # Simplify architecture
-    arch_map = {
+# Simplified OS and architecture names for platform labels
+OS_DISPLAY_NAMES = MappingProxyType(
+    {"Darwin": "macOS", "Windows": "Windows", "Linux": "Linux"}
+)
+ARCH_DISPLAY_NAMES = MappingProxyType(
+    {
         "x86_64": "x64",
         "AMD64": "x64",
         "arm64": "ARM64",
         "aarch64": "ARM64",
     }
-    arch_display = arch_map.get(arch, arch)
+)
+
+
+# JSON paths (in ijson prefix notation) of the fields read from each benchmark
+# file: first as written by benchmark.py, then in the older flat layout
+FIELD_PATHS = {
+    "acquire_zarr": (
+        "summary.acquire_zarr.throughput_gib_per_s.mean",
+        "acquire_zarr.throughput_gib_per_s",
+    ),
+    "tensorstore": (
+        "summary.tensorstore.throughput_gib_per_s.mean",
+        "tensorstore.throughput_gib_per_s",
+    ),
+    "git_commit_hash": ("runs.item.git_commit_hash", "git_commit_hash"),
+    "test_parameters": ("runs.item.test_parameters", "test_parameters"),
+    "system_info": ("runs.item.system_info", "system_info"),
+}
+PATH_FIELDS = {
+    path: field for field, paths in FIELD_PATHS.items() for path in paths
+}
+
+
+_MISSING = object()
+
+
+def _lookup(document, path: str):
+    """Follow an ijson-style prefix into a parsed document, taking the first
+    element wherever the path says "item". Returns _MISSING if absent."""
+    node = document
+    for key in path.split("."):
+        if key == "item" and isinstance(node, list) and node:
+            node = node[0]
+        elif isinstance(node, dict) and key in node:
+            node = node[key]
+        else:
+            return _MISSING
+    return node
+
+
+def extract_fields(path: Path) -> dict:
+    """Read only the fields named in FIELD_PATHS from a benchmark file.
+
+    With ijson installed, the file is streamed and no objects are built for
+    the fields we skip (e.g. per-frame timings); otherwise it is parsed in
+    full. "system_info" defaults to an empty dict.
+    """
+    fields = {}
+    if ijson is None:
+        document = json_loads(Path(path).read_bytes())
+        for field, paths in FIELD_PATHS.items():
+            for field_path in paths:
+                if (value := _lookup(document, field_path)) is not _MISSING:
+                    fields[field] = value
+                    break
+    else:
+        builder = None
+        building = None  # (field, prefix) of the object being built
+        with open(path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if building is not None:
+                    builder.event(event, value)
+                    if prefix == building[1] and event in (
+                        "end_map",
+                        "end_array",
+                    ):
+                        fields[building[0]] = builder.value
+                        building = None
+                        if len(fields) == len(FIELD_PATHS):
+                            break
+                    continue
+
+                field = PATH_FIELDS.get(prefix)
+                if field is None or field in fields:
+                    continue
+
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    building = (field, prefix)
+                elif event not in ("end_map", "end_array", "map_key"):
+                    fields[field] = value
+
+                if len(fields) == len(FIELD_PATHS):
+                    break
+
+    fields.setdefault("system_info", {})
+    return fields
+
+
+@functools.lru_cache(maxsize=None)
+def create_platform_label(os_name: str, arch: str) -> str:
+    """Create a readable platform label from an OS name and architecture."""
+    os_display = OS_DISPLAY_NAMES.get(os_name, os_name)
+    arch_display = ARCH_DISPLAY_NAMES.get(arch, arch)
 
     return f"{os_display} {arch_display}"
 
@@ -52,27 +158,36 @@ def get_cpu_config(system_info: dict) -> tuple:
 def plot_benchmarks(input_dir, output_prefix):
     """Plot throughput comparison across platforms from benchmark JSON files."""
 
-    pattern = re.compile(r"benchmark-(.+)-([a-f0-9]+)\.json")
-
     data = {}
-    input_path = Path(input_dir)
 
-    for filepath in input_path.glob("benchmark-*.json"):
-        match = pattern.match(filepath.name)
-        if not match:
-            continue
+    with os.scandir(input_dir) as it:
+        entries = [
+            (entry, match)
+            for entry in it
+            if (match := BENCHMARK_FILE_PATTERN.fullmatch(entry.name))
+            and entry.is_file(follow_symlinks=False)
+        ]
 
-        platform = match.group(1)
+    # Files are independent, so read and parse them concurrently
+    paths = [entry.path for entry, _ in entries]
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(paths)))) as ex:
+        parsed = list(ex.map(extract_fields, paths))
 
-        with open(filepath) as f:
-            result = json.load(f)
+    for (_, match), result in zip(entries, parsed):
+        platform = match.group(1)
 
+        system_info = result["system_info"]
         data[platform] = {
-            "acquire_zarr": result["acquire_zarr"]["throughput_gib_per_s"],
-            "tensorstore": result["tensorstore"]["throughput_gib_per_s"],
+            "acquire_zarr": result["acquire_zarr"],
+            "tensorstore": result["tensorstore"],
             "git_commit_hash": result["git_commit_hash"],
             "test_parameters": result["test_parameters"],
-            "system_info": result.get("system_info", {}),
+            "system_info": system_info,
+            "label": create_platform_label(
+                system_info.get("platform", platform),
+                system_info.get("architecture", ""),
+            ),
+            "cpu_brand": system_info.get("cpu_brand", ""),
         }
 
     if not data:
@@ -80,19 +195,20 @@ def plot_benchmarks(input_dir, output_prefix):
         return
 
     # Verify all benchmarks use same commit and parameters
-    hashes = {data[p]["git_commit_hash"] for p in data}
-    assert (
-        len(hashes) == 1
-    ), "All benchmarks must be from the same git commit hash"
-    commit_hash = hashes.pop()
-
-    test_params = {
-        tuple(sorted(data[p]["test_parameters"].items())) for p in data
-    }
-    assert (
-        len(test_params) == 1
-    ), "All benchmarks must use the same test parameters"
-    params = dict(test_params.pop())
+    commit_hash = params = None
+    for platform, platform_data in data.items():
+        if commit_hash is None:
+            commit_hash = platform_data["git_commit_hash"]
+            params = platform_data["test_parameters"]
+            continue
+        assert platform_data["git_commit_hash"] == commit_hash, (
+            "All benchmarks must be from the same git commit hash "
+            f"({platform} has {platform_data['git_commit_hash']}, "
+            f"expected {commit_hash})"
+        )
+        assert (
+            platform_data["test_parameters"] == params
+        ), f"All benchmarks must use the same test parameters ({platform})"
 
     str_params = (
         f"t_chunk={params['t_chunk_size']}, "
@@ -102,59 +218,66 @@ def plot_benchmarks(input_dir, output_prefix):
     )
     print(f"Benchmark parameters: {str_params}")
 
+    # One record per platform; missing CPU counts are stored as 0
+    rows = []
+    for platform_data in data.values():
+        physical, logical = get_cpu_config(platform_data["system_info"])
+        rows.append(
+            (
+                platform_data["acquire_zarr"],
+                platform_data["tensorstore"],
+                physical or 0,
+                logical or 0,
+                platform_data["cpu_brand"],
+                platform_data["label"],
+            )
+        )
+    records = np.array(
+        rows,
+        dtype=[
+            ("az", "f8"),
+            ("ts", "f8"),
+            ("physical", "i4"),
+            ("logical", "i4"),
+            ("cpu_brand", "U128"),
+            ("label", "U64"),
+        ],
+    )
+
     # Group by CPU configuration
-    cpu_groups = {}
-    for platform_name, platform_data in data.items():
-        cpu_config = get_cpu_config(platform_data["system_info"])
-        if cpu_config not in cpu_groups:
-            cpu_groups[cpu_config] = {}
-        cpu_groups[cpu_config][platform_name] = platform_data
-
-    # Create a plot for each CPU configuration group
-    for cpu_config, platforms_data in cpu_groups.items():
-        physical, logical = cpu_config
+    cpu_configs = np.stack([records["physical"], records["logical"]], axis=1)
+    groups, group_index = np.unique(cpu_configs, axis=0, return_inverse=True)
+    group_index = group_index.reshape(-1)
+
+    # Create a plot for each CPU configuration group, reusing one figure
+    fig, ax = plt.subplots(figsize=(12, 6))
+    width = 0.35
+    bar_positions = {}  # number of platforms -> (x, x - w/2, x + w/2)
+    for g, (physical, logical) in enumerate(groups):
         cpu_label = (
             f"{physical}p{logical}l" if physical and logical else "unknown"
         )
 
-        # Create platform labels
-        platform_labels = {}
-        for platform_name, platform_data in platforms_data.items():
-            label = create_platform_label(
-                platform_name, platform_data["system_info"]
-            )
-
-            # Add CPU brand to subtitle if available
-            cpu_brand = platform_data["system_info"].get("cpu_brand", "")
-            platform_labels[platform_name] = (label, cpu_brand)
-
         # Sort by platform label
-        sorted_platforms = sorted(
-            platforms_data.keys(), key=lambda p: platform_labels[p][0]
-        )
+        group = records[group_index == g]
+        group = group[np.argsort(group["label"], kind="stable")]
 
-        az_throughput = [
-            platforms_data[p]["acquire_zarr"] for p in sorted_platforms
-        ]
-        ts_throughput = [
-            platforms_data[p]["tensorstore"] for p in sorted_platforms
-        ]
-        display_labels = [platform_labels[p][0] for p in sorted_platforms]
+        az_throughput = group["az"]
+        ts_throughput = group["ts"]
+        display_labels = group["label"].tolist()
 
         # Collect unique CPU brands for subtitle
-        cpu_brands = set(
-            platform_labels[p][1]
-            for p in sorted_platforms
-            if platform_labels[p][1]
-        )
-        cpu_subtitle = ", ".join(sorted(cpu_brands)) if cpu_brands else ""
+        cpu_brands = np.unique(group["cpu_brand"][group["cpu_brand"] != ""])
+        cpu_subtitle = ", ".join(cpu_brands.tolist())
 
-        x = np.arange(len(sorted_platforms))
-        width = 0.35
+        if len(group) not in bar_positions:
+            x = np.arange(len(group))
+            bar_positions[len(group)] = (x, x - width / 2, x + width / 2)
+        x, x_az, x_ts = bar_positions[len(group)]
 
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.bar(x - width / 2, az_throughput, width, label="acquire-zarr")
-        ax.bar(x + width / 2, ts_throughput, width, label="tensorstore")
+        ax.clear()
+        ax.bar(x_az, az_throughput, width, label="acquire-zarr")
+        ax.bar(x_ts, ts_throughput, width, label="tensorstore")
 
         ax.set_ylabel("Throughput (GiB/s)")
 
@@ -175,12 +298,18 @@ def plot_benchmarks(input_dir, output_prefix):
         ax.legend()
         ax.grid(axis="y", alpha=0.3)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         output_file = f"{output_prefix}_{cpu_label}.png"
-        plt.savefig(output_file, dpi=150)
+        # Low zlib level: much faster to encode for a modestly larger file
+        fig.savefig(
+            output_file,
+            dpi=150,
+            pil_kwargs={"compress_level": 1, "optimize": False},
+        )
         print(f"Plot saved to {output_file}")
-        plt.close()
+
+    plt.close(fig)
 
 
 if __name__ == "__main__":
@@ -21,37 +21,26 @@ from acquire_zarr import (
 def make_sample_data():
     """Generate sample data with moving diagonal pattern for 4D array (t, z, y, x)"""
     width, height, depth = 64, 48, 10
-    frames = []
+    t, y, x = np.ogrid[:10, :height, :width]
 
-    for t in range(10):
-        volume = np.zeros((depth, height, width), dtype=np.uint16)
+    # Create a diagonal pattern that moves with time
+    diagonal = (x + y + t * 8) % 32
 
-        for z in range(depth):
-            for y in range(height):
-                for x in range(width):
-                    # Create a diagonal pattern that moves with time
-                    diagonal = (x + y + t * 8) % 32
+    # Create intensity variation: ramp up, then ramp down
+    intensity = np.where(diagonal < 16, diagonal, 31 - diagonal) * 4096
 
-                    # Create intensity variation
-                    if diagonal < 16:
-                        intensity = diagonal * 4096  # Ramp up
-                    else:
-                        intensity = (31 - diagonal) * 4096  # Ramp down
+    # Add circular features
+    center_x, center_y = width // 2, height // 2
+    radius = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2).astype(int)
 
-                    # Add circular features
-                    center_x, center_y = width // 2, height // 2
-                    dx, dy = x - center_x, y - center_y
-                    radius = int(np.sqrt(dx * dx + dy * dy))
-
-                    # Modulate with concentric circles
-                    if radius % 16 < 8:
-                        intensity = int(intensity * 0.7)
-
-                    volume[z, y, x] = intensity
-
-        frames.append(volume)
+    # Modulate with concentric circles
+    intensity = np.where(
+        radius % 16 < 8, (intensity * 0.7).astype(int), intensity
+    )
 
-    return np.array(frames)
+    # The pattern does not vary with z, so repeat each frame through depth
+    volume = intensity.astype(np.uint16)[:, np.newaxis]
+    return np.repeat(volume, depth, axis=1)
 
 
 def main():
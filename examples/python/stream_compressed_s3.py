@@ -21,36 +21,24 @@ from acquire_zarr import (
 def make_sample_data():
     """Generate sample data with moving diagonal pattern"""
     width, height = 64, 48
-    frames = []
+    t, y, x = np.ogrid[:50, :height, :width]
 
-    for t in range(50):
-        frame = np.zeros((height, width), dtype=np.uint16)
+    # Create a diagonal pattern that moves with time
+    diagonal = (x + y + t * 8) % 32
 
-        for y in range(height):
-            for x in range(width):
-                # Create a diagonal pattern that moves with time
-                diagonal = (x + y + t * 8) % 32
+    # Create intensity variation: ramp up, then ramp down
+    intensity = np.where(diagonal < 16, diagonal, 31 - diagonal) * 4096
 
-                # Create intensity variation
-                if diagonal < 16:
-                    intensity = diagonal * 4096  # Ramp up
-                else:
-                    intensity = (31 - diagonal) * 4096  # Ramp down
+    # Add circular features
+    center_x, center_y = width // 2, height // 2
+    radius = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2).astype(int)
 
-                # Add circular features
-                center_x, center_y = width // 2, height // 2
-                dx, dy = x - center_x, y - center_y
-                radius = int(np.sqrt(dx * dx + dy * dy))
-
-                # Modulate with concentric circles
-                if radius % 16 < 8:
-                    intensity = int(intensity * 0.7)
-
-                frame[y, x] = intensity
-
-        frames.append(frame)
+    # Modulate with concentric circles
+    intensity = np.where(
+        radius % 16 < 8, (intensity * 0.7).astype(int), intensity
+    )
 
-    return np.array(frames)
+    return intensity.astype(np.uint16)
 
 
 def main():
@@ -12,9 +12,11 @@ from acquire_zarr import (
     CompressionSettings,
 )
 
+rng = np.random.default_rng()
+
 
 def make_sample_data():
-    return np.random.randint(
+    return rng.integers(
         0,
         65535,
         (5, 4, 2, 48, 64),  # Shape matches chunk sizes
@@ -15,6 +15,8 @@ from acquire_zarr import (
 
 from typing import Tuple
 
+rng = np.random.default_rng()
+
 
 def make_sample_data(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
     is_int = np.issubdtype(dtype, np.integer)
@@ -22,9 +24,16 @@ def make_sample_data(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
     typemax = np.iinfo(dtype).max if is_int else np.finfo(dtype).max
 
     if is_int:
-        return np.random.randint(typemin, typemax, shape, dtype=dtype)
+        return rng.integers(typemin, typemax, shape, dtype=dtype)
     elif np.issubdtype(dtype, np.floating):
-        return np.random.uniform(typemin, typemax, shape).astype(dtype)
+        # draw straight into the output dtype, with no float64 temporary
+        arr = rng.random(shape, dtype=dtype)
+        # map [0, 1) onto [typemin, typemax) = [-typemax, typemax) in place;
+        # typemax - typemin itself would overflow
+        arr *= 2
+        arr -= 1
+        arr *= typemax
+        return arr
     else:
         raise ValueError(f"Unsupported data type: {dtype}")
 
@@ -81,11 +90,13 @@ def main():
             ),
             ArraySettings(
                 output_key="a/float32/array",
+                # LZ4 keeps up with streaming acquisition; for archival
+                # storage, BLOSC_ZSTD compresses further at a higher CPU cost
                 compression=CompressionSettings(
                     compressor=Compressor.BLOSC1,
-                    codec=CompressionCodec.BLOSC_ZSTD,
-                    level=3,
-                    shuffle=2,
+                    codec=CompressionCodec.BLOSC_LZ4,
+                    level=1,
+                    shuffle=1,
                 ),
                 dimensions=[
                     Dimension(
@@ -9,11 +9,13 @@ from acquire_zarr import (
     DownsamplingMethod,
 )
 
+rng = np.random.default_rng()
+
 
 def make_sample_data():
     """Generate sample data matching the 5D structure (t, c, z, y, x)"""
     # Shape: (10 timepoints, 8 channels, 6 z-slices, 48 height, 64 width)
-    return np.random.randint(0, 65535, (10, 8, 6, 48, 64), dtype=np.uint16)
+    return rng.integers(0, 65535, (10, 8, 6, 48, 64), dtype=np.uint16)
 
 
 def main():
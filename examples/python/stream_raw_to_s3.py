@@ -14,9 +14,11 @@ from acquire_zarr import (
     S3Settings,
 )
 
+rng = np.random.default_rng()
+
 
 def make_sample_data():
-    return np.random.randint(
+    return rng.integers(
         0, 65535, (5, 2, 48, 64), dtype=np.uint16  # Shape matches chunk sizes
     )
 
@@ -1,9 +1,17 @@
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 
+@pytest.fixture(scope="session")
+def _cleanup_pool():
+    # stores are deleted in the background; exiting waits for them all
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
 @pytest.fixture
-def store_path(tmp_path):
+def store_path(tmp_path, _cleanup_pool):
     yield tmp_path
-    shutil.rmtree(tmp_path, ignore_errors=True)
+    _cleanup_pool.submit(shutil.rmtree, tmp_path, ignore_errors=True)
@@ -1,4 +1,5 @@
 import json
+import math
 from pathlib import Path
 
 import numpy as np
@@ -50,6 +51,18 @@ DIMS = {
     ),
 }
 
+# The same dimensions with array_size_px=0, for use as an unbounded dim 0
+UNBOUNDED_DIMS = {
+    name: Dimension(
+        name=dim.name,
+        kind=dim.kind,
+        array_size_px=0,
+        chunk_size_px=dim.chunk_size_px,
+        shard_size_chunks=dim.shard_size_chunks,
+    )
+    for name, dim in DIMS.items()
+}
+
 
 @pytest.mark.parametrize(
     "input_dims,output_dims,append_dim_size",
@@ -83,19 +96,10 @@ def test_dimension_transposition(
     (array_size_px=0) and append_dim_size specifies the actual number of
     elements to write along that dimension.
     """
-    # Build dimensions, creating a new object for dim 0 if unbounded
-    dimensions = []
-    for i, name in enumerate(input_dims):
-        dim = DIMS[name]
-        if i == 0 and append_dim_size is not None:
-            dim = Dimension(  # copy with array_size_px=0
-                name=dim.name,
-                kind=dim.kind,
-                array_size_px=0,
-                chunk_size_px=dim.chunk_size_px,
-                shard_size_chunks=dim.shard_size_chunks,
-            )
-        dimensions.append(dim)
+    # Build dimensions, using the unbounded variant for dim 0 if requested
+    dimensions = [DIMS[name] for name in input_dims]
+    if append_dim_size is not None:
+        dimensions[0] = UNBOUNDED_DIMS[input_dims[0]]
 
     array = ArraySettings(
         dimensions=dimensions,
@@ -114,42 +118,46 @@ def test_dimension_transposition(
 
     input_shape = tuple(_get_size(n) for n in input_dims)
     output_shape = tuple(_get_size(n) for n in output_dims)
-    n_frames = np.prod(input_shape[:-2])
+    n_frames = math.prod(input_shape[:-2])
     if output_dims and output_dims != input_dims:
         assert (
             input_shape != output_shape
         ), "Input and output shapes should differ for this test case"
 
     # Write frames with sequential values (0, 1, 2, ...)
-    # Frames are written in input dimension order
+    # Frames are written in input dimension order, all in a single append
     expected_frame_values = np.arange(n_frames, dtype=np.uint8)
-    for val in expected_frame_values:
-        stream.append(np.full(input_shape[-2:], val, dtype=np.uint8))
+    frames = np.broadcast_to(
+        expected_frame_values[:, np.newaxis, np.newaxis],
+        (n_frames, *input_shape[-2:]),
+    )
+    stream.append(np.ascontiguousarray(frames))
     stream.close()
 
     # Verify metadata has axes in prescribed order
-    array_metadata = json.loads(Path(store_path / "zarr.json").read_text())
+    array_metadata = json.loads((store_path / "zarr.json").read_bytes())
     axis_names = array_metadata["dimension_names"]
     assert (
         axis_names == output_dims
     ), f"Expected metadata axes in {output_dims} order, got {axis_names}"
 
     # Verify data is stored in prescribed order
-    written_data = np.asarray(zarr.open_array(store_path))
+    written_data = zarr.open_array(store_path)
     assert (
         written_data.shape == output_shape
     ), f"Expected written data with shape {output_shape}, got {written_data.shape}"
 
-    # Each frame was written with np.full(), so all pixels have the same value.
-    # Extract one value per plane to get the frame numbers as stored.
+    # Every pixel in a frame has the same value, so reading one pixel per
+    # plane (only the chunks containing it) gives the frame numbers as stored.
     stored_frame_values = written_data[..., 0, 0]
 
     # Build expected frame values: start in input order, transpose if needed
     # we need to reshape because expected_frame_values is 1D initially but
     # stored_frame_values is in the full output shape
     expected_frame_values = expected_frame_values.reshape(input_shape[:-2])
-    if output_dims and output_dims != input_dims:
-        perm = [input_dims.index(d) for d in output_dims[:-2]]
+    input_index = {d: i for i, d in enumerate(input_dims)}
+    perm = tuple(input_index[d] for d in output_dims[:-2])
+    if perm != tuple(range(len(perm))):
         expected_frame_values = np.transpose(expected_frame_values, perm)
 
     # Verify the stored frame values match the expected transposition
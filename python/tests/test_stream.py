@@ -39,6 +39,18 @@ from acquire_zarr import (
     get_log_level,
 )
 
+# Blosc settings shared by the codec-parametrized tests; assigning one to
+# ArraySettings.compression copies it.
+BLOSC_COMPRESSION = {
+    codec: CompressionSettings(
+        compressor=Compressor.BLOSC1,
+        codec=codec,
+        level=1,
+        shuffle=1,
+    )
+    for codec in (CompressionCodec.BLOSC_LZ4, CompressionCodec.BLOSC_ZSTD)
+}
+
 
 @pytest.fixture(scope="function")
 def settings():
@@ -264,21 +276,21 @@ def create_hcs_settings():
 
 def validate_v3_metadata(store_path: Path):
     assert (store_path / "zarr.json").is_file()
-    with open(store_path / "zarr.json", "r") as fh:
-        data = json.load(fh)
-        assert data["zarr_format"] == 3
-        assert data["node_type"] == "group"
-        assert data["consolidated_metadata"] is None
+    data = json.loads((store_path / "zarr.json").read_bytes())
+
+    assert data["zarr_format"] == 3
+    assert data["node_type"] == "group"
+    assert data["consolidated_metadata"] is None
 
-        axes = data["attributes"]["ome"]["multiscales"][0]["axes"]
-        assert axes[0]["name"] == "t"
-        assert axes[0]["type"] == "time"
+    axes = data["attributes"]["ome"]["multiscales"][0]["axes"]
+    assert axes[0]["name"] == "t"
+    assert axes[0]["type"] == "time"
 
-        assert axes[1]["name"] == "y"
-        assert axes[1]["type"] == "space"
+    assert axes[1]["name"] == "y"
+    assert axes[1]["type"] == "space"
 
-        assert axes[2]["name"] == "x"
-        assert axes[2]["type"] == "space"
+    assert axes[2]["name"] == "x"
+    assert axes[2]["type"] == "space"
 
     assert not (store_path / "acquire.json").is_file()
 
@@ -318,18 +330,13 @@ def test_stream_data_to_filesystem(
 ):
     settings.store_path = str(store_path / "test.zarr")
     if compression_codec is not None:
-        settings.arrays[0].compression = CompressionSettings(
-            compressor=Compressor.BLOSC1,
-            codec=compression_codec,
-            level=1,
-            shuffle=1,
-        )
+        settings.arrays[0].compression = BLOSC_COMPRESSION[compression_codec]
     settings.arrays[0].data_type = np.uint16
 
     stream = ZarrStream(settings)
     assert stream
 
-    data = np.zeros(
+    data = np.empty(
         (
             2 * settings.arrays[0].dimensions[0].chunk_size_px,
             settings.arrays[0].dimensions[1].array_size_px,
@@ -337,8 +344,7 @@ def test_stream_data_to_filesystem(
         ),
         dtype=np.uint16,
     )
-    for i in range(data.shape[0]):
-        data[i, :, :] = i
+    data[...] = np.arange(data.shape[0], dtype=np.uint16)[:, None, None]
 
     stream.append(data)
 
@@ -554,12 +560,7 @@ def test_skip(
     dim_settings = array_settings.dimensions
 
     if compression_codec is not None:
-        array_settings.compression = CompressionSettings(
-            compressor=Compressor.BLOSC1,
-            codec=compression_codec,
-            level=1,
-            shuffle=1,
-        )
+        array_settings.compression = BLOSC_COMPRESSION[compression_codec]
     array_settings.data_type = np.uint16
 
     stream = ZarrStream(settings)
@@ -618,18 +619,13 @@ def test_stream_data_to_s3(
     settings.s3 = s3_settings
 
     if compression_codec is not None:
-        settings.arrays[0].compression = CompressionSettings(
-            compressor=Compressor.BLOSC1,
-            codec=compression_codec,
-            level=1,
-            shuffle=1,
-        )
+        settings.arrays[0].compression = BLOSC_COMPRESSION[compression_codec]
     settings.arrays[0].data_type = np.uint16
 
     stream = ZarrStream(settings)
     assert stream
 
-    data = np.random.randint(
+    data = np.random.default_rng(0).integers(
         0,
         65535,
         (
@@ -747,8 +743,7 @@ def test_write_custom_metadata(
         metadata_path = Path(settings.store_path) / "zarr.json"
 
     assert metadata_path.is_file()
-    with open(metadata_path, "r") as fh:
-        data = json.load(fh)
+    data = json.loads(metadata_path.read_bytes())
 
     assert "attributes" in data
     attributes = data["attributes"]
@@ -1616,8 +1611,7 @@ def validate_generic_group_metadata(base_path: Path):
     for path in paths:
         assert path.exists(), f"Missing metadata file: {path}"
 
-        with open(path, "r") as f:
-            metadata = json.load(f)
+        metadata = json.loads(path.read_bytes())
 
         assert metadata["zarr_format"] == 3
         assert metadata["consolidated_metadata"] is None
@@ -1630,8 +1624,7 @@ def validate_plate_metadata(base_path: Path):
     plate_path = base_path / "test_plate" / "zarr.json"
     assert plate_path.exists()
 
-    with open(plate_path, "r") as f:
-        metadata = json.load(f)
+    metadata = json.loads(plate_path.read_bytes())
 
     assert metadata["zarr_format"] == 3
     assert metadata["consolidated_metadata"] is None
@@ -1712,8 +1705,7 @@ def validate_well_metadata(base_path: Path):
     for i, path in enumerate(paths):
         assert path.exists()
 
-        with open(path, "r") as f:
-            metadata = json.load(f)
+        metadata = json.loads(path.read_bytes())
 
         assert metadata["zarr_format"] == 3
         assert metadata["consolidated_metadata"] is None